@@ -1,6 +1,163 @@
 import gradio as gr
 from shared.utils.plugins import WAN2GPPlugin
-import json
+import os
+import time
+from dataclasses import dataclass, fields
+
+def _dumps_config(config):
+    # same layout as the other writers of the config file (wgp.py, plugin manager)
+    import json
+    return json.dumps(config, indent=4)
+
+def _write_config_file(path, payload):
+    # write to a temporary file then swap it in, so an interrupted save never leaves a truncated config
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as writer:
+        writer.write(payload)
+        writer.flush()
+        os.fsync(writer.fileno())
+    os.replace(tmp_path, path)
+
+_MISSING = object()
+
+_ATTENTION_BASE_CHOICES = (
+    ("Auto: Best available (sage2 > sage > sdpa)", "auto"),
+    ("sdpa: Default, always available", "sdpa"),
+)
+# (attention mode, label suffix, only offered in beta test mode)
+_ATTENTION_OPTIONAL_MODES = (
+    ("flash", "High quality, requires manual install", False),
+    ("xformers", "Good quality, less VRAM, requires manual install", False),
+    ("sage", "~30% faster, requires manual install", False),
+    ("sage2", "~40% faster, requires manual install", False),
+    ("radial", "Experimental, may be faster, requires manual install", True),
+    ("sage3", ">50% faster, may have quality trade-offs, requires manual install", False),
+)
+_ATTENTION_MODE_NAMES = {"sage2": "sage2/sage2++"}
+_MODEL_HIERARCHY_CHOICES = (
+    ("Two Levels: Model Family > Models & Finetunes", 0),
+    ("Three Levels: Model Family > Models > Finetunes", 1),
+)
+_FIT_CANVAS_CHOICES = (
+    ("Dimensions are Pixel Budget (preserves aspect ratio, may exceed dimensions)", 0),
+    ("Dimensions are Max Width/Height (preserves aspect ratio, fits within box)", 1),
+    ("Dimensions are Exact Output (crops input to fit exact dimensions)", 2),
+)
+_PRELOAD_MODEL_POLICY_CHOICES = (("Preload Model on App Launch","P"), ("Preload Model on Switch", "S"), ("Unload Model when Queue is Done", "U"))
+_CLEAR_FILE_LIST_CHOICES = (("None", 0), ("Keep last video", 1), ("Keep last 5 videos", 5), ("Keep last 10", 10), ("Keep last 20", 20), ("Keep last 30", 30))
+_DISPLAY_STATS_CHOICES = (("Disabled", 0), ("Enabled", 1))
+_MAX_FRAMES_MULTIPLIER_CHOICES = (("Default", 1), ("x2", 2), ("x3", 3), ("x4", 4), ("x5", 5), ("x6", 6), ("x7", 7))
+_UI_THEME_CHOICES = (("Blue Sky (Default)", "default"), ("Classic Gradio", "gradio"))
+_QUEUE_COLOR_SCHEME_CHOICES = (
+    ("Pastel (Unique color for each item)", "pastel"),
+    ("Alternating Grey Shades", "alternating_grey"),
+)
+_QUANTIZATION_CHOICES = (("Scaled Int8 (recommended)", "int8"), ("16-bit (no quantization)", "bf16"))
+_TRANSFORMER_DTYPE_POLICY_CHOICES = (("Auto (Best for Hardware)", ""), ("FP16", "fp16"), ("BF16", "bf16"))
+_MIXED_PRECISION_CHOICES = (("16-bit only (less VRAM)", "0"), ("Mixed 16/32-bit (better quality)", "1"))
+_TEXT_ENCODER_QUANTIZATION_CHOICES = (("16-bit (more RAM, better quality)", "bf16"), ("8-bit (less RAM, slightly lower quality)", "int8"))
+_VAE_PRECISION_CHOICES = (("16-bit (faster, less VRAM)", "16"), ("32-bit (slower, better for sliding window)", "32"))
+_COMPILE_CHOICES = (("On (up to 20% faster, requires Triton)", "transformer"), ("Off", ""))
+_DEPTH_ANYTHING_V2_VARIANT_CHOICES = (("Large (more precise, slower)", "vitl"), ("Big (less precise, faster)", "vitb"))
+_VAE_CONFIG_CHOICES = (("Auto", 0), ("Disabled (fastest, high VRAM)", 1), ("256x256 Tiles (for >=8GB VRAM)", 2), ("128x128 Tiles (for >=6GB VRAM)", 3))
+_BOOST_CHOICES = (("ON", 1), ("OFF", 2))
+_ENHANCER_ENABLED_CHOICES = (("Off", 0), ("Florence 2 + LLama 3.2", 1), ("Florence 2 + Llama Joy (uncensored)", 2))
+_ENHANCER_MODE_CHOICES = (("Automatic on Generation", 0), ("On-Demand Button Only", 1))
+_MMAUDIO_ENABLED_CHOICES = (("Off", 0), ("Enabled (unloads after use)", 1), ("Enabled (persistent in RAM)", 2))
+_VIDEO_OUTPUT_CODEC_CHOICES = (("x265 CRF 28 (Balanced)", 'libx265_28'), ("x264 Level 8 (Balanced)", 'libx264_8'), ("x265 CRF 8 (High Quality)", 'libx265_8'), ("x264 Level 10 (High Quality)", 'libx264_10'), ("x264 Lossless", 'libx264_lossless'))
+_IMAGE_OUTPUT_CODEC_CHOICES = (("JPEG Q85", 'jpeg_85'), ("WEBP Q85", 'webp_85'), ("JPEG Q95", 'jpeg_95'), ("WEBP Q95", 'webp_95'), ("WEBP Lossless", 'webp_lossless'), ("PNG Lossless", 'png'))
+_AUDIO_OUTPUT_CODEC_CHOICES = (("AAC 128 kbit", 'aac_128'),)
+_METADATA_CHOICES = (("Export JSON files", "json"), ("Embed metadata in file (Exif/tag)", "metadata"), ("None", "none"))
+_NOTIFICATION_SOUND_ENABLED_CHOICES = (("On", 1), ("Off", 0))
+
+# defaults shown in the form when a setting is missing from server_config
+_CONFIG_DEFAULTS = {
+    "model_hierarchy_type": 1, "fit_canvas": 0, "clear_file_list": 5, "display_stats": 0,
+    "max_frames_multiplier": 1, "UI_theme": "default", "queue_color_scheme": "pastel",
+    "mixed_precision": "0", "vae_precision": "16", "depth_anything_v2_variant": "vitl", "preload_in_VRAM": 0,
+    "enhancer_enabled": 0, "enhancer_mode": 0, "mmaudio_enabled": 0,
+    "video_output_codec": "libx264_8", "image_output_codec": "jpeg_95", "audio_output_codec": "aac_128",
+    "metadata_type": "metadata", "embed_source_images": False,
+    "notification_sound_enabled": 0, "notification_sound_volume": 50,
+}
+# server_config keys whose form value comes from a wgp global (which may be overridden on the command line)
+_CONFIG_GLOBALS = {
+    "transformer_types": "transformer_types", "attention_mode": "attention_mode",
+    "preload_model_policy": "preload_model_policy", "transformer_quantization": "transformer_quantization",
+    "transformer_dtype_policy": "transformer_dtype_policy", "text_encoder_quantization": "text_encoder_quantization",
+    "compile": "compile", "vae_config": "vae_config", "boost": "boost", "profile": "default_profile",
+    "save_path": "save_path", "image_save_path": "image_save_path",
+}
+
+def _get_setting(server_config, key):
+    return server_config.get(key, _CONFIG_DEFAULTS[key])
+
+# (component attribute, choices, label, server_config key, locked by --lock-config)
+_PERFORMANCE_DROPDOWNS = (
+    ("quantization_choice", _QUANTIZATION_CHOICES, "Transformer Model Quantization (if available)", "transformer_quantization", False),
+    ("transformer_dtype_policy_choice", _TRANSFORMER_DTYPE_POLICY_CHOICES, "Transformer Data Type (if available)", "transformer_dtype_policy", False),
+    ("mixed_precision_choice", _MIXED_PRECISION_CHOICES, "Transformer Engine Precision", "mixed_precision", False),
+    ("text_encoder_quantization_choice", _TEXT_ENCODER_QUANTIZATION_CHOICES, "Text Encoder Precision", "text_encoder_quantization", False),
+    ("VAE_precision_choice", _VAE_PRECISION_CHOICES, "VAE Encoding/Decoding Precision", "vae_precision", False),
+    ("compile_choice", _COMPILE_CHOICES, "Compile Transformer Model", "compile", True),
+    ("depth_anything_v2_variant_choice", _DEPTH_ANYTHING_V2_VARIANT_CHOICES, "Depth Anything v2 VACE Preprocessor", "depth_anything_v2_variant", False),
+    ("vae_config_choice", _VAE_CONFIG_CHOICES, "VAE Tiling (to reduce VRAM usage)", "vae_config", False),
+    ("boost_choice", _BOOST_CHOICES, "Boost (~10% speedup for ~1GB VRAM)", "boost", False),
+)
+
+# settings that are applied to the running app without reloading the model
+_NO_RELOAD_KEYS = frozenset({
+    "attention_mode", "vae_config", "boost", "save_path", "image_save_path",
+    "metadata_type", "clear_file_list", "fit_canvas", "depth_anything_v2_variant",
+    "notification_sound_enabled", "notification_sound_volume", "mmaudio_enabled",
+    "max_frames_multiplier", "display_stats", "video_output_codec", "video_container",
+    "embed_source_images", "image_output_codec", "audio_output_codec", "checkpoints_paths",
+    "model_hierarchy_type", "UI_theme", "queue_color_scheme"
+})
+# settings that are only read when the UI is built (labelled "requires restart")
+_RESTART_REQUIRED_LABELS = {
+    "display_stats": "Display real-time RAM/VRAM stats", "max_frames_multiplier": "Max Frames Multiplier",
+    "UI_theme": "UI Theme", "save_path": "Video Output Folder", "image_save_path": "Image Output Folder",
+}
+
+# Save form values, in the order of the Save button inputs; field names match the component attributes
+@dataclass(slots=True)
+class ConfigFormArgs:
+    transformer_types_choices: list
+    model_hierarchy_type_choice: int
+    fit_canvas_choice: int
+    attention_choice: str
+    preload_model_policy_choice: list
+    clear_file_list_choice: int
+    display_stats_choice: int
+    max_frames_multiplier_choice: int
+    checkpoints_paths_choice: str
+    UI_theme_choice: str
+    queue_color_scheme_choice: str
+    quantization_choice: str
+    transformer_dtype_policy_choice: str
+    mixed_precision_choice: str
+    text_encoder_quantization_choice: str
+    VAE_precision_choice: str
+    compile_choice: str
+    depth_anything_v2_variant_choice: str
+    vae_config_choice: int
+    boost_choice: int
+    profile_choice: int
+    preload_in_VRAM_choice: float
+    enhancer_enabled_choice: int
+    enhancer_mode_choice: int
+    mmaudio_enabled_choice: int
+    video_output_codec_choice: str
+    image_output_codec_choice: str
+    audio_output_codec_choice: str
+    metadata_choice: str
+    embed_source_images_choice: bool
+    video_save_path_choice: str
+    image_save_path_choice: str
+    notification_sound_enabled_choice: int
+    notification_sound_volume_choice: float
+    resolution: str
 
 class ConfigTabPlugin(WAN2GPPlugin):
     def __init__(self):
@@ -8,6 +165,7 @@ class ConfigTabPlugin(WAN2GPPlugin):
         self.name = "Configuration Tab"
         self.version = "1.1.0"
         self.description = "Lets you adjust all your performance and UI options for WAN2GP"
+        self._last_release_ts = 0.0
 
     def setup_ui(self):
         self.request_global("args")
@@ -55,7 +213,15 @@ class ConfigTabPlugin(WAN2GPPlugin):
             position=4
         )
 
+    def _get_ui_default(self, key):
+        if key in _CONFIG_GLOBALS:
+            return getattr(self, _CONFIG_GLOBALS[key])
+        if key == "checkpoints_paths":
+            return self.fl.default_checkpoints_paths
+        return _CONFIG_DEFAULTS.get(key, _MISSING)
+
     def create_config_ui(self):
+        server_config = self.server_config
         with gr.Column():
             with gr.Tabs():
                 with gr.Tab("General"):
@@ -66,61 +232,50 @@ class ConfigTabPlugin(WAN2GPPlugin):
                         label="Selectable Generative Models (leave empty for all)", multiselect=True
                     )
                     self.model_hierarchy_type_choice = gr.Dropdown(
-                        choices=[
-                            ("Two Levels: Model Family > Models & Finetunes", 0),
-                            ("Three Levels: Model Family > Models > Finetunes", 1),
-                        ],
-                        value=self.server_config.get("model_hierarchy_type", 1),
+                        choices=_MODEL_HIERARCHY_CHOICES,
+                        value=_get_setting(server_config, "model_hierarchy_type"),
                         label="Models Hierarchy In User Interface",
                         interactive=not self.args.lock_config
                     )
                     self.fit_canvas_choice = gr.Dropdown(
-                        choices=[
-                            ("Dimensions are Pixel Budget (preserves aspect ratio, may exceed dimensions)", 0),
-                            ("Dimensions are Max Width/Height (preserves aspect ratio, fits within box)", 1),
-                            ("Dimensions are Exact Output (crops input to fit exact dimensions)", 2),
-                        ],
-                        value=self.server_config.get("fit_canvas", 0),
+                        choices=_FIT_CANVAS_CHOICES,
+                        value=_get_setting(server_config, "fit_canvas"),
                         label="Input Image/Video Sizing Behavior",
                         interactive=not self.args.lock_config
                     )
 
+                    installed, supported = frozenset(self.attention_modes_installed), frozenset(self.attention_modes_supported)
+
                     def check_attn(mode):
-                        if mode not in self.attention_modes_installed: return " (NOT INSTALLED)"
-                        if mode not in self.attention_modes_supported: return " (NOT SUPPORTED)"
+                        if mode not in installed: return " (NOT INSTALLED)"
+                        if mode not in supported: return " (NOT SUPPORTED)"
                         return ""
 
                     self.attention_choice = gr.Dropdown(
-                        choices=[
-                            ("Auto: Best available (sage2 > sage > sdpa)", "auto"),
-                            ("sdpa: Default, always available", "sdpa"),
-                            (f'flash{check_attn("flash")}: High quality, requires manual install', "flash"),
-                            (f'xformers{check_attn("xformers")}: Good quality, less VRAM, requires manual install', "xformers"),
-                            (f'sage{check_attn("sage")}: ~30% faster, requires manual install', "sage"),
-                            (f'sage2/sage2++{check_attn("sage2")}: ~40% faster, requires manual install', "sage2"),
-                        ] + ([(f'radial{check_attn("radial")}: Experimental, may be faster, requires manual install', "radial")] if self.args.betatest else []) + [
-                            (f'sage3{check_attn("sage3")}: >50% faster, may have quality trade-offs, requires manual install', "sage3"),
-                        ],
+                        choices=_ATTENTION_BASE_CHOICES + tuple(
+                            (f'{_ATTENTION_MODE_NAMES.get(mode, mode)}{check_attn(mode)}: {suffix}', mode)
+                            for mode, suffix, betatest_only in _ATTENTION_OPTIONAL_MODES if self.args.betatest or not betatest_only
+                        ),
                         value=self.attention_mode, label="Attention Type", interactive=not self.args.lock_config
                     )
                     self.preload_model_policy_choice = gr.CheckboxGroup(
-                        [("Preload Model on App Launch","P"), ("Preload Model on Switch", "S"), ("Unload Model when Queue is Done", "U")],
+                        _PRELOAD_MODEL_POLICY_CHOICES,
                         value=self.preload_model_policy, label="Model Loading/Unloading Policy"
                     )
                     self.clear_file_list_choice = gr.Dropdown(
-                        choices=[("None", 0), ("Keep last video", 1), ("Keep last 5 videos", 5), ("Keep last 10", 10), ("Keep last 20", 20), ("Keep last 30", 30)],
-                        value=self.server_config.get("clear_file_list", 5), label="Keep Previous Generations in Gallery"
+                        choices=_CLEAR_FILE_LIST_CHOICES,
+                        value=_get_setting(server_config, "clear_file_list"), label="Keep Previous Generations in Gallery"
                     )
                     self.display_stats_choice = gr.Dropdown(
-                        choices=[("Disabled", 0), ("Enabled", 1)],
-                        value=self.server_config.get("display_stats", 0), label="Display real-time RAM/VRAM stats (requires restart)"
+                        choices=_DISPLAY_STATS_CHOICES,
+                        value=_get_setting(server_config, "display_stats"), label="Display real-time RAM/VRAM stats (requires restart)"
                     )
                     self.max_frames_multiplier_choice = gr.Dropdown(
-                        choices=[("Default", 1), ("x2", 2), ("x3", 3), ("x4", 4), ("x5", 5), ("x6", 6), ("x7", 7)],
-                        value=self.server_config.get("max_frames_multiplier", 1), label="Max Frames Multiplier (requires restart)"
+                        choices=_MAX_FRAMES_MULTIPLIER_CHOICES,
+                        value=_get_setting(server_config, "max_frames_multiplier"), label="Max Frames Multiplier (requires restart)"
                     )
                     default_paths = self.fl.default_checkpoints_paths
-                    checkpoints_paths_text = "\n".join(self.server_config.get("checkpoints_paths", default_paths))
+                    checkpoints_paths_text = "\n".join(server_config.get("checkpoints_paths", default_paths))
                     self.checkpoints_paths_choice = gr.Textbox(
                         label="Model Checkpoint Folders (One Path per Line. First is Default Download Path)",
                         value=checkpoints_paths_text,
@@ -128,47 +283,39 @@ class ConfigTabPlugin(WAN2GPPlugin):
                         interactive=not self.args.lock_config
                     )
                     self.UI_theme_choice = gr.Dropdown(
-                        choices=[("Blue Sky (Default)", "default"), ("Classic Gradio", "gradio")],
-                        value=self.server_config.get("UI_theme", "default"), label="UI Theme (requires restart)"
+                        choices=_UI_THEME_CHOICES,
+                        value=_get_setting(server_config, "UI_theme"), label="UI Theme (requires restart)"
                     )
                     self.queue_color_scheme_choice = gr.Dropdown(
-                        choices=[
-                            ("Pastel (Unique color for each item)", "pastel"),
-                            ("Alternating Grey Shades", "alternating_grey"),
-                        ],
-                        value=self.server_config.get("queue_color_scheme", "pastel"),
+                        choices=_QUEUE_COLOR_SCHEME_CHOICES,
+                        value=_get_setting(server_config, "queue_color_scheme"),
                         label="Queue Color Scheme"
                     )
 
                 with gr.Tab("Performance"):
-                    self.quantization_choice = gr.Dropdown(choices=[("Scaled Int8 (recommended)", "int8"), ("16-bit (no quantization)", "bf16")], value=self.transformer_quantization, label="Transformer Model Quantization (if available)")
-                    self.transformer_dtype_policy_choice = gr.Dropdown(choices=[("Auto (Best for Hardware)", ""), ("FP16", "fp16"), ("BF16", "bf16")], value=self.transformer_dtype_policy, label="Transformer Data Type (if available)")
-                    self.mixed_precision_choice = gr.Dropdown(choices=[("16-bit only (less VRAM)", "0"), ("Mixed 16/32-bit (better quality)", "1")], value=self.server_config.get("mixed_precision", "0"), label="Transformer Engine Precision")
-                    self.text_encoder_quantization_choice = gr.Dropdown(choices=[("16-bit (more RAM, better quality)", "bf16"), ("8-bit (less RAM, slightly lower quality)", "int8")], value=self.text_encoder_quantization, label="Text Encoder Precision")
-                    self.VAE_precision_choice = gr.Dropdown(choices=[("16-bit (faster, less VRAM)", "16"), ("32-bit (slower, better for sliding window)", "32")], value=self.server_config.get("vae_precision", "16"), label="VAE Encoding/Decoding Precision")
-                    self.compile_choice = gr.Dropdown(choices=[("On (up to 20% faster, requires Triton)", "transformer"), ("Off", "")], value=self.compile, label="Compile Transformer Model", interactive=not self.args.lock_config)
-                    self.depth_anything_v2_variant_choice = gr.Dropdown(choices=[("Large (more precise, slower)", "vitl"), ("Big (less precise, faster)", "vitb")], value=self.server_config.get("depth_anything_v2_variant", "vitl"), label="Depth Anything v2 VACE Preprocessor")
-                    self.vae_config_choice = gr.Dropdown(choices=[("Auto", 0), ("Disabled (fastest, high VRAM)", 1), ("256x256 Tiles (for >=8GB VRAM)", 2), ("128x128 Tiles (for >=6GB VRAM)", 3)], value=self.vae_config, label="VAE Tiling (to reduce VRAM usage)")
-                    self.boost_choice = gr.Dropdown(choices=[("ON", 1), ("OFF", 2)], value=self.boost, label="Boost (~10% speedup for ~1GB VRAM)")
+                    for attr, choices, label, key, lockable in _PERFORMANCE_DROPDOWNS:
+                        value = getattr(self, _CONFIG_GLOBALS[key]) if key in _CONFIG_GLOBALS else _get_setting(server_config, key)
+                        interactive = not self.args.lock_config if lockable else None
+                        setattr(self, attr, gr.Dropdown(choices=choices, value=value, label=label, interactive=interactive))
                     self.profile_choice = gr.Dropdown(choices=self.memory_profile_choices, value=self.default_profile, label="Memory Profile (Advanced)")
-                    self.preload_in_VRAM_choice = gr.Slider(0, 40000, value=self.server_config.get("preload_in_VRAM", 0), step=100, label="VRAM (MB) for Preloaded Models (0=profile default)")
+                    self.preload_in_VRAM_choice = gr.Slider(0, 40000, value=_get_setting(server_config, "preload_in_VRAM"), step=100, label="VRAM (MB) for Preloaded Models (0=profile default)")
                     self.release_RAM_btn = gr.Button("Force Unload Models from RAM")
 
                 with gr.Tab("Extensions"):
-                    self.enhancer_enabled_choice = gr.Dropdown(choices=[("Off", 0), ("Florence 2 + LLama 3.2", 1), ("Florence 2 + Llama Joy (uncensored)", 2)], value=self.server_config.get("enhancer_enabled", 0), label="Prompt Enhancer (requires 8-14GB extra download)")
-                    self.enhancer_mode_choice = gr.Dropdown(choices=[("Automatic on Generation", 0), ("On-Demand Button Only", 1)], value=self.server_config.get("enhancer_mode", 0), label="Prompt Enhancer Usage")
-                    self.mmaudio_enabled_choice = gr.Dropdown(choices=[("Off", 0), ("Enabled (unloads after use)", 1), ("Enabled (persistent in RAM)", 2)], value=self.server_config.get("mmaudio_enabled", 0), label="MMAudio Soundtrack Generation (requires 10GB extra download)")
+                    self.enhancer_enabled_choice = gr.Dropdown(choices=_ENHANCER_ENABLED_CHOICES, value=_get_setting(server_config, "enhancer_enabled"), label="Prompt Enhancer (requires 8-14GB extra download)")
+                    self.enhancer_mode_choice = gr.Dropdown(choices=_ENHANCER_MODE_CHOICES, value=_get_setting(server_config, "enhancer_mode"), label="Prompt Enhancer Usage")
+                    self.mmaudio_enabled_choice = gr.Dropdown(choices=_MMAUDIO_ENABLED_CHOICES, value=_get_setting(server_config, "mmaudio_enabled"), label="MMAudio Soundtrack Generation (requires 10GB extra download)")
 
                 with gr.Tab("Outputs"):
-                    self.video_output_codec_choice = gr.Dropdown(choices=[("x265 CRF 28 (Balanced)", 'libx265_28'), ("x264 Level 8 (Balanced)", 'libx264_8'), ("x265 CRF 8 (High Quality)", 'libx265_8'), ("x264 Level 10 (High Quality)", 'libx264_10'), ("x264 Lossless", 'libx264_lossless')], value=self.server_config.get("video_output_codec", "libx264_8"), label="Video Codec")
-                    self.image_output_codec_choice = gr.Dropdown(choices=[("JPEG Q85", 'jpeg_85'), ("WEBP Q85", 'webp_85'), ("JPEG Q95", 'jpeg_95'), ("WEBP Q95", 'webp_95'), ("WEBP Lossless", 'webp_lossless'), ("PNG Lossless", 'png')], value=self.server_config.get("image_output_codec", "jpeg_95"), label="Image Codec")
-                    self.audio_output_codec_choice = gr.Dropdown(choices=[("AAC 128 kbit", 'aac_128')], value=self.server_config.get("audio_output_codec", "aac_128"), visible=False, label="Audio Codec to use")
+                    self.video_output_codec_choice = gr.Dropdown(choices=_VIDEO_OUTPUT_CODEC_CHOICES, value=_get_setting(server_config, "video_output_codec"), label="Video Codec")
+                    self.image_output_codec_choice = gr.Dropdown(choices=_IMAGE_OUTPUT_CODEC_CHOICES, value=_get_setting(server_config, "image_output_codec"), label="Image Codec")
+                    self.audio_output_codec_choice = gr.Dropdown(choices=_AUDIO_OUTPUT_CODEC_CHOICES, value=_get_setting(server_config, "audio_output_codec"), visible=False, label="Audio Codec to use")
                     self.metadata_choice = gr.Dropdown(
-                        choices=[("Export JSON files", "json"), ("Embed metadata in file (Exif/tag)", "metadata"), ("None", "none")],
-                        value=self.server_config.get("metadata_type", "metadata"), label="Metadata Handling"
+                        choices=_METADATA_CHOICES,
+                        value=_get_setting(server_config, "metadata_type"), label="Metadata Handling"
                     )
                     self.embed_source_images_choice = gr.Checkbox(
-                        value=self.server_config.get("embed_source_images", False),
+                        value=_get_setting(server_config, "embed_source_images"),
                         label="Embed Source Images",
                         info="Saves i2v source images inside MP4 files"
                     )
@@ -176,45 +323,38 @@ class ConfigTabPlugin(WAN2GPPlugin):
                     self.image_save_path_choice = gr.Textbox(label="Image Output Folder (requires restart)", value=self.image_save_path)
 
                 with gr.Tab("Notifications"):
-                    self.notification_sound_enabled_choice = gr.Dropdown(choices=[("On", 1), ("Off", 0)], value=self.server_config.get("notification_sound_enabled", 0), label="Notification Sound")
-                    self.notification_sound_volume_choice = gr.Slider(0, 100, value=self.server_config.get("notification_sound_volume", 50), step=5, label="Notification Volume")
+                    self.notification_sound_enabled_choice = gr.Dropdown(choices=_NOTIFICATION_SOUND_ENABLED_CHOICES, value=_get_setting(server_config, "notification_sound_enabled"), label="Notification Sound")
+                    self.notification_sound_volume_choice = gr.Slider(0, 100, value=_get_setting(server_config, "notification_sound_volume"), step=5, label="Notification Volume")
 
             self.msg = gr.Markdown()
             with gr.Row():
                 self.apply_btn = gr.Button("Save Settings")
 
-        inputs = [
-            self.state,
-            self.transformer_types_choices, self.model_hierarchy_type_choice, self.fit_canvas_choice,
-            self.attention_choice, self.preload_model_policy_choice, self.clear_file_list_choice,
-            self.display_stats_choice, self.max_frames_multiplier_choice, self.checkpoints_paths_choice,
-            self.UI_theme_choice, self.queue_color_scheme_choice,
-            self.quantization_choice, self.transformer_dtype_policy_choice, self.mixed_precision_choice,
-            self.text_encoder_quantization_choice, self.VAE_precision_choice, self.compile_choice,
-            self.depth_anything_v2_variant_choice, self.vae_config_choice, self.boost_choice,
-            self.profile_choice, self.preload_in_VRAM_choice,
-            self.enhancer_enabled_choice, self.enhancer_mode_choice, self.mmaudio_enabled_choice,
-            self.video_output_codec_choice, self.image_output_codec_choice, self.audio_output_codec_choice,
-            self.metadata_choice, self.embed_source_images_choice,
-            self.video_save_path_choice, self.image_save_path_choice,
-            self.notification_sound_enabled_choice, self.notification_sound_volume_choice,
-            self.resolution
-        ]
+        self._save_inputs = (self.state, *[getattr(self, field.name) for field in fields(ConfigFormArgs)])
+        self._save_outputs = (
+            self.msg,
+            self.header,
+            self.model_family,
+            self.model_base_type_choice,
+            self.model_choice,
+            self.refresh_form_trigger,
+            self.checkpoints_paths_choice
+        )
 
         self.apply_btn.click(
-            fn=self._save_changes,
-            inputs=inputs,
-            outputs=[
-                self.msg,
-                self.header,
-                self.model_family,
-                self.model_base_type_choice,
-                self.model_choice,
-                self.refresh_form_trigger
-            ]
+            fn=lambda: gr.update(interactive=False), inputs=[], outputs=[self.apply_btn], queue=False
+        ).then(
+            fn=self._save_changes, inputs=list(self._save_inputs), outputs=list(self._save_outputs)
+        ).then(
+            fn=lambda: gr.update(interactive=True), inputs=[], outputs=[self.apply_btn], queue=False
         )
 
         def release_ram_and_notify():
+            now = time.monotonic()
+            if now - self._last_release_ts < 1.0:
+                gr.Info("Models already unloaded from RAM.")
+                return
+            self._last_release_ts = now
             self.release_model()
             gr.Info("Models unloaded from RAM.")
         
@@ -223,88 +363,66 @@ class ConfigTabPlugin(WAN2GPPlugin):
 
     def _save_changes(self, state, *args):
         if self.is_generation_in_progress():
-            return "<div style='color:red; text-align:center;'>Unable to change config when a generation is in progress.</div>", *[gr.update()]*5
+            return "<div style='color:red; text-align:center;'>Unable to change config when a generation is in progress.</div>", *[gr.update()]*6
 
         if self.args.lock_config:
-            return "<div style='color:red; text-align:center;'>Configuration is locked by command-line arguments.</div>", *[gr.update()]*5
+            return "<div style='color:red; text-align:center;'>Configuration is locked by command-line arguments.</div>", *[gr.update()]*6
 
         old_server_config = self.server_config.copy()
 
-        (
-            transformer_types_choices, model_hierarchy_type_choice, fit_canvas_choice,
-            attention_choice, preload_model_policy_choice, clear_file_list_choice,
-            display_stats_choice, max_frames_multiplier_choice, checkpoints_paths_choice,
-            UI_theme_choice, queue_color_scheme_choice,
-            quantization_choice, transformer_dtype_policy_choice, mixed_precision_choice,
-            text_encoder_quantization_choice, VAE_precision_choice, compile_choice,
-            depth_anything_v2_variant_choice, vae_config_choice, boost_choice,
-            profile_choice, preload_in_VRAM_choice,
-            enhancer_enabled_choice, enhancer_mode_choice, mmaudio_enabled_choice,
-            video_output_codec_choice, image_output_codec_choice, audio_output_codec_choice,
-            metadata_choice, embed_source_images_choice,
-            save_path_choice, image_save_path_choice,
-            notification_sound_enabled_choice, notification_sound_volume_choice,
-            last_resolution_choice
-        ) = args
-
-        if len(checkpoints_paths_choice.strip()) == 0:
-            checkpoints_paths = self.fl.default_checkpoints_paths
-        else:
-            checkpoints_paths = [path.strip() for path in checkpoints_paths_choice.replace("\r", "").split("\n") if len(path.strip()) > 0]
+        cfg = ConfigFormArgs(*args)
+
+        checkpoints_paths = [path for path in (line.strip() for line in cfg.checkpoints_paths_choice.splitlines()) if path] or self.fl.default_checkpoints_paths
 
         self.fl.set_checkpoints_paths(checkpoints_paths)
 
-        new_server_config = {
-            "attention_mode": attention_choice, "transformer_types": transformer_types_choices,
-            "text_encoder_quantization": text_encoder_quantization_choice, "save_path": save_path_choice,
-            "image_save_path": image_save_path_choice, "compile": compile_choice, "profile": profile_choice,
-            "vae_config": vae_config_choice, "vae_precision": VAE_precision_choice,
-            "mixed_precision": mixed_precision_choice, "metadata_type": metadata_choice,
-            "transformer_quantization": quantization_choice, "transformer_dtype_policy": transformer_dtype_policy_choice,
-            "boost": boost_choice, "clear_file_list": clear_file_list_choice,
-            "preload_model_policy": preload_model_policy_choice, "UI_theme": UI_theme_choice,
-            "fit_canvas": fit_canvas_choice, "enhancer_enabled": enhancer_enabled_choice,
-            "enhancer_mode": enhancer_mode_choice, "mmaudio_enabled": mmaudio_enabled_choice,
-            "preload_in_VRAM": preload_in_VRAM_choice, "depth_anything_v2_variant": depth_anything_v2_variant_choice,
-            "notification_sound_enabled": notification_sound_enabled_choice,
-            "notification_sound_volume": notification_sound_volume_choice,
-            "max_frames_multiplier": max_frames_multiplier_choice, "display_stats": display_stats_choice,
-            "video_output_codec": video_output_codec_choice, "image_output_codec": image_output_codec_choice,
-            "audio_output_codec": audio_output_codec_choice,
-            "model_hierarchy_type": model_hierarchy_type_choice,
+        candidates = {
+            "attention_mode": cfg.attention_choice, "transformer_types": cfg.transformer_types_choices,
+            "text_encoder_quantization": cfg.text_encoder_quantization_choice, "save_path": cfg.video_save_path_choice,
+            "image_save_path": cfg.image_save_path_choice, "compile": cfg.compile_choice, "profile": cfg.profile_choice,
+            "vae_config": cfg.vae_config_choice, "vae_precision": cfg.VAE_precision_choice,
+            "mixed_precision": cfg.mixed_precision_choice, "metadata_type": cfg.metadata_choice,
+            "transformer_quantization": cfg.quantization_choice, "transformer_dtype_policy": cfg.transformer_dtype_policy_choice,
+            "boost": cfg.boost_choice, "clear_file_list": cfg.clear_file_list_choice,
+            "preload_model_policy": cfg.preload_model_policy_choice, "UI_theme": cfg.UI_theme_choice,
+            "fit_canvas": cfg.fit_canvas_choice, "enhancer_enabled": cfg.enhancer_enabled_choice,
+            "enhancer_mode": cfg.enhancer_mode_choice, "mmaudio_enabled": cfg.mmaudio_enabled_choice,
+            "preload_in_VRAM": cfg.preload_in_VRAM_choice, "depth_anything_v2_variant": cfg.depth_anything_v2_variant_choice,
+            "notification_sound_enabled": cfg.notification_sound_enabled_choice,
+            "notification_sound_volume": cfg.notification_sound_volume_choice,
+            "max_frames_multiplier": cfg.max_frames_multiplier_choice, "display_stats": cfg.display_stats_choice,
+            "video_output_codec": cfg.video_output_codec_choice, "image_output_codec": cfg.image_output_codec_choice,
+            "audio_output_codec": cfg.audio_output_codec_choice,
+            "model_hierarchy_type": cfg.model_hierarchy_type_choice,
             "checkpoints_paths": checkpoints_paths,
-            "queue_color_scheme": queue_color_scheme_choice,
-            "embed_source_images": embed_source_images_choice,
+            "queue_color_scheme": cfg.queue_color_scheme_choice,
+            "embed_source_images": cfg.embed_source_images_choice,
             "video_container": "mp4", # Fixed to MP4
             "last_model_type": state["model_type"],
             "last_model_per_family": state["last_model_per_family"],
             "last_model_per_type": state["last_model_per_type"],
-            "last_advanced_choice": state["advanced"], "last_resolution_choice": last_resolution_choice,
+            "last_advanced_choice": state["advanced"], "last_resolution_choice": cfg.resolution,
             "last_resolution_per_group": state["last_resolution_per_group"],
         }
-        
-        if "enabled_plugins" in self.server_config:
-            new_server_config["enabled_plugins"] = self.server_config["enabled_plugins"]
 
         if self.args.lock_config:
-            if "attention_mode" in old_server_config: new_server_config["attention_mode"] = old_server_config["attention_mode"]
-            if "compile" in old_server_config: new_server_config["compile"] = old_server_config["compile"]
+            if "attention_mode" in old_server_config: candidates["attention_mode"] = old_server_config["attention_mode"]
+            if "compile" in old_server_config: candidates["compile"] = old_server_config["compile"]
 
-        with open(self.server_config_filename, "w", encoding="utf-8") as writer:
-            writer.write(json.dumps(new_server_config, indent=4))
-        
-        changes = [k for k, v in new_server_config.items() if v != old_server_config.get(k)]
+        patch = {k: v for k, v in candidates.items() if old_server_config.get(k, _MISSING) != v}
+        if not patch:
+            return "<div style='color:green; text-align:center;'>No changes to save.</div>", *[gr.update()]*6
 
-        no_reload_keys = [
-            "attention_mode", "vae_config", "boost", "save_path", "image_save_path",
-            "metadata_type", "clear_file_list", "fit_canvas", "depth_anything_v2_variant",
-            "notification_sound_enabled", "notification_sound_volume", "mmaudio_enabled",
-            "max_frames_multiplier", "display_stats", "video_output_codec", "video_container",
-            "embed_source_images", "image_output_codec", "audio_output_codec", "checkpoints_paths",
-            "model_hierarchy_type", "UI_theme", "queue_color_scheme"
-        ]
+        # update in place so that every holder of server_config (wgp, other plugins) sees the new settings
+        self.server_config.update(patch)
+        new_server_config = self.server_config
+        _write_config_file(self.server_config_filename, _dumps_config(new_server_config))
+        
+        # a setting missing from the old config was showing its form default, so it only changed if it differs from that
+        changes = [k for k, v in patch.items() if old_server_config.get(k, self._get_ui_default(k)) != v]
 
-        needs_reload = not all(change in no_reload_keys for change in changes)
+        needs_reload = not _NO_RELOAD_KEYS.issuperset(changes)
+        restart_changes = [label for k, label in _RESTART_REQUIRED_LABELS.items() if k in changes]
 
         self.set_global("server_config", new_server_config)
         self.set_global("three_levels_hierarchy", new_server_config["model_hierarchy_type"] == 1)
@@ -331,16 +449,24 @@ class ConfigTabPlugin(WAN2GPPlugin):
                 self.enhancer_offloadobj.release()
                 self.set_global("enhancer_offloadobj", None)
 
+        # only the checkpoint folders are normalised on save, so that's the only form field that may need refreshing
+        checkpoints_paths_text = "\n".join(checkpoints_paths)
         model_type = state["model_type"]
         
         model_family_update, model_base_type_update, model_choice_update = self.generate_dropdown_model_list(model_type)
         header_update = self.generate_header(model_type, compile=new_server_config["compile"], attention_mode=new_server_config["attention_mode"])
         
+        if restart_changes:
+            msg = f"<div style='color:green; text-align:center;'>The new configuration has been saved. Restart WanGP to apply: {', '.join(restart_changes)}.</div>"
+        else:
+            msg = "<div style='color:green; text-align:center;'>The new configuration has been succesfully applied.</div>"
+
         return (
-            "<div style='color:green; text-align:center;'>The new configuration has been succesfully applied.</div>",
+            msg,
             header_update,
             model_family_update,
             model_base_type_update,
             model_choice_update,
-            self.get_unique_id()
+            self.get_unique_id(),
+            gr.update(value=checkpoints_paths_text) if checkpoints_paths_text != cfg.checkpoints_paths_choice else gr.update()
         )
\ No newline at end of file
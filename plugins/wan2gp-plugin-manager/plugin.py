@@ -3,6 +3,7 @@ from shared.utils.plugins import WAN2GPPlugin
 import os
 import json
 import traceback
+import threading
 from wgp import quit_application
 import requests
 
@@ -330,10 +331,22 @@ class PluginManagerUIPlugin(WAN2GPPlugin):
 
     def _save_and_restart(self, enabled_plugins: list):
         self.server_config["enabled_plugins"] = enabled_plugins
-        with open(self.server_config_filename, "w", encoding="utf-8") as writer:
-            writer.write(json.dumps(self.server_config, indent=4))
+        # the app is about to quit: make sure the config is fully on disk (and never left truncated) first
+        tmp_filename = self.server_config_filename + ".tmp"
+        try:
+            with open(tmp_filename, "w", encoding="utf-8") as writer:
+                writer.write(json.dumps(self.server_config, indent=4))
+                writer.flush()
+                os.fsync(writer.fileno())
+            os.replace(tmp_filename, self.server_config_filename)
+        except Exception as e:
+            gr.Warning(f"Failed to save plugin settings, restart aborted: {e}")
+            return
         gr.Info("Settings saved. Restarting application...")
-        quit_application()
+        # give the notification time to reach the browser before the server goes down
+        quit_timer = threading.Timer(0.2, quit_application)
+        quit_timer.daemon = True
+        quit_timer.start()
 
     def _handle_save_action(self, payload_str: str):
         if not payload_str: